@@ -7,18 +7,33 @@ import zivid
 import zivid.experimental.calibration
 import zmq
 import zlib
+import json
+import struct
+import io
 import os
+import mmap
+import pickle
+import socket as sk
+import threading
 from collections import deque
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QVBoxLayout, 
                              QHBoxLayout, QWidget, QPushButton, QFileDialog, 
                              QColorDialog, QDialog, QLineEdit, QMessageBox,
                              QListWidget, QListWidgetItem, QAbstractItemView)
-from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QPen, QFont, QIcon
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QPoint, QSize
+from PyQt6.QtGui import (QImage, QPixmap, QPainter, QPainterPath, QColor,
+                         QPen, QFont, QIcon)
+from PyQt6.QtCore import (QThread, pyqtSignal, Qt, QPoint, QSize, QTimer,
+                          QLineF, QRunnable, QThreadPool)
 
 import pyvista as pv
 from pyvistaqt import QtInteractor
 
+# SIMD-Dispatch für die Per-Frame-Operationen (imencode, resize, cvtColor im
+# Zivid-Pfad) sicherstellen; 1 Thread, damit OpenCV nicht gegen GUI- und
+# Capture-Thread um Kerne konkurriert
+cv2.setUseOptimized(True)
+cv2.setNumThreads(1)
+
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
@@ -26,7 +41,23 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+class _ThumbDecodeTask(QRunnable):
+    # Dekodiert ein Thumbnail abseits des GUI-Threads; QImage darf dort
+    # entstehen, die QPixmap erst im Slot auf dem GUI-Thread
+    def __init__(self, row, data, callback):
+        super().__init__()
+        self._row = row
+        self._data = data
+        self._callback = callback
+
+    def run(self):
+        img = QImage()
+        img.loadFromData(self._data)
+        self._callback(self._row, img)
+
 class TextureSelectorDialog(QDialog):
+    _thumb_ready = pyqtSignal(int, QImage)
+
     def __init__(self, texture_list, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Textur wählen")
@@ -48,19 +79,25 @@ class TextureSelectorDialog(QDialog):
         
         self.tex_data_map = {}
 
-        for tex in texture_list:
+        # Erst Platzhalter einfügen, dann die PNG-Decodes in den globalen
+        # Threadpool geben — der Dialog öffnet sofort statt N Thumbnails
+        # synchron auf dem GUI-Thread zu dekodieren
+        placeholder = QPixmap(100, 100)
+        placeholder.fill(QColor("#555"))
+        placeholder_icon = QIcon(placeholder)
+        self._thumb_ready.connect(self._set_thumb)
+        pool = QThreadPool.globalInstance()
+
+        for row, tex in enumerate(texture_list):
             name = tex["name"]
             thumb_bytes = tex["thumbnail"]
-            self.tex_data_map[name] = thumb_bytes 
-            
-            pixmap = QPixmap()
-            pixmap.loadFromData(thumb_bytes)
-            icon = QIcon(pixmap)
-            
-            item = QListWidgetItem(icon, name)
+            self.tex_data_map[name] = thumb_bytes
+
+            item = QListWidgetItem(placeholder_icon, name)
             item.setSizeHint(QSize(120, 140))
             self.list_widget.addItem(item)
-            
+            pool.start(_ThumbDecodeTask(row, thumb_bytes, self._thumb_ready.emit))
+
         self.list_widget.itemDoubleClicked.connect(self.accept_selection)
         layout.addWidget(self.list_widget)
         
@@ -69,6 +106,11 @@ class TextureSelectorDialog(QDialog):
         btn_select.clicked.connect(self.accept_selection)
         layout.addWidget(btn_select)
 
+    def _set_thumb(self, row, image):
+        item = self.list_widget.item(row)
+        if item is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+
     def accept_selection(self, arg=None):
         item = None
         if isinstance(arg, QListWidgetItem):
@@ -111,28 +153,43 @@ class ManualConnectDialog(QDialog):
         self.btn_connect.setEnabled(False)
         self.btn_connect.setText("Prüfe Verbindung...")
         self.status_label.setText(f"Sende Ping an {ip}:5555 ...")
-        QApplication.processEvents() 
+        QApplication.processEvents()
 
-        context = zmq.Context()
+        # Billiger TCP-Vorab-Check (200 ms): bei Tippfehlern friert der Dialog
+        # so nicht die vollen 2 s RCVTIMEO ein
+        probe = sk.socket()
+        probe.settimeout(0.2)
+        try:
+            reachable = probe.connect_ex((ip, 5555)) == 0
+        except OSError:
+            reachable = False
+        finally:
+            probe.close()
+        if not reachable:
+            self.show_error("Timeout", f"Unter {ip}:5555 ist kein Server erreichbar.")
+            self.btn_connect.setEnabled(True); self.btn_connect.setText("Verbinden & Prüfen")
+            return
+
+        context = zmq.Context.instance()
         socket = context.socket(zmq.REQ)
         socket.setsockopt(zmq.RCVTIMEO, 2000)
         socket.setsockopt(zmq.LINGER, 0)
         try:
             socket.connect(f"tcp://{ip}:5555")
-            socket.send_pyobj({"cmd": "PING"})
+            # Roher 4-Byte-Ping statt gepickeltem Dict
+            socket.send(b"PING")
             reply = socket.recv_string()
             self.status_label.setText("✅ Server gefunden!")
             self.status_label.setStyleSheet("color: green;")
             self.entered_ip = ip
             socket.close()
-            context.term()
             super().accept()
         except zmq.Again:
             self.show_error("Timeout", f"Der Server unter {ip} antwortet nicht.")
         except Exception as e:
             self.show_error("Fehler", f"Verbindungsfehler: {e}")
         finally:
-            if not socket.closed: socket.close(); context.term()
+            if not socket.closed: socket.close()
             self.btn_connect.setEnabled(True); self.btn_connect.setText("Verbinden & Prüfen")
 
     def show_error(self, title, msg):
@@ -142,55 +199,395 @@ class ManualConnectDialog(QDialog):
 
 class ClickableVideoLabel(QLabel):
     on_click = pyqtSignal(int, int)
+    # Callback fürs Vektor-Overlay (Box, Achsen, Maske, FPS): wird direkt auf
+    # das Widget gezeichnet statt in die Video-Pixmap, damit die Rasterebene
+    # pro Frame nur per setPixmap getauscht wird und unangetastet bleibt.
+    # overlay_visible ist der billige Vorab-Check, der auf dem Default-Pfad
+    # (Kamera läuft, kein Tracking, keine Maske) den QPainter ganz einspart.
+    paint_overlay = None
+    overlay_visible = None
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.on_click.emit(event.pos().x(), event.pos().y())
         super().mousePressEvent(event)
 
-class ResultReceiver(QThread):
-    new_result = pyqtSignal(list, np.ndarray, float)
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.paint_overlay is None:
+            return
+        if self.overlay_visible is not None and not self.overlay_visible():
+            return
+        painter = QPainter(self)
+        try:
+            self.paint_overlay(painter)
+        finally:
+            painter.end()
+
+class ResultReceiver(threading.Thread):
+    # Bewusst kein QThread: der Loop macht reines ZMQ-I/O, und der Handoff
+    # zur GUI läuft über eine "neuester gewinnt"-Deque, die der Render-Timer
+    # abholt — ohne Qt-Signal-Marshalling pro Paket
     def __init__(self, ip):
-        super().__init__()
+        super().__init__(daemon=True)
         self.running = True
-        self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.PULL)
-        self.socket.connect(f"tcp://{ip}:5557") 
-        self.socket.setsockopt(zmq.RCVTIMEO, 1000) 
+        # Begrenzte Deque statt maxlen=1: FPS-Zählung und Pose-Log brauchen
+        # jedes Paket, nur die Anzeige ist "neuester gewinnt"
+        self.result_queue = deque(maxlen=64)
+        # Ein Kontext (und damit ein I/O-Thread-Pool) für die ganze App
+        self.context = zmq.Context.instance()
+        # SUB statt PULL: PUB/SUB mit CONFLATE garantiert "nur das neueste
+        # Paket überlebt" auch unter Lastspitzen, und der Server kann mehrere
+        # Clients bedienen, ohne dass PULL fair-queued
+        self.socket = self.context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.CONFLATE, 1)
+        self.socket.setsockopt(zmq.RCVBUF, 4 * 1024 * 1024)
+        self.socket.setsockopt(zmq.SUBSCRIBE, b"")
+        self.socket.connect(f"tcp://{ip}:5557")
+        # Inproc-PAIR als Weckkanal: der Loop blockiert im Poller statt einmal
+        # pro Sekunde per RCVTIMEO aufzuwachen, und stop() greift sofort
+        self._wake_recv = self.context.socket(zmq.PAIR)
+        self._wake_recv.bind("inproc://result-wake")
+        self._wake_send = self.context.socket(zmq.PAIR)
+        self._wake_send.connect("inproc://result-wake")
     def run(self):
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        poller.register(self._wake_recv, zmq.POLLIN)
         while self.running:
+            socks = dict(poller.poll())
+            if self._wake_recv in socks:
+                break
+            if self.socket not in socks:
+                continue
             try:
-                packet = self.socket.recv_pyobj()
-                if "box_points" in packet and "pose" in packet:
-                    points = packet["box_points"]
-                    pose = packet["pose"]
-                    timestamp = packet.get("timestamp", 0)
-                    self.new_result.emit(points, pose, timestamp)
-            except zmq.Again: continue
+                raw = self.socket.recv()
+                if raw[:3] == RESULT_MAGIC:
+                    # Gepacktes Binärpaket: kein pickle, feste Offsets
+                    fields = RESULT_PACKET.unpack_from(raw, 3)
+                    timestamp = fields[0]
+                    pose = np.array(fields[1:17], np.float32).reshape(4, 4)
+                    points = [(fields[17 + 2*i], fields[18 + 2*i]) for i in range(8)]
+                    self.result_queue.append((points, pose, timestamp))
+                else:
+                    # Fallback: gepickeltes Dict älterer Server
+                    packet = pickle.loads(raw)
+                    if "box_points" in packet and "pose" in packet:
+                        points = packet["box_points"]
+                        pose = packet["pose"]
+                        timestamp = packet.get("timestamp", 0)
+                        self.result_queue.append((points, pose, timestamp))
             except Exception: pass
     def stop(self):
-        self.running = False; self.wait()
+        self.running = False
+        try: self._wake_send.send(b"")
+        except Exception: pass
+        self.join()
+        self.socket.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+# Festes Binärlayout des Videoframe-Headers:
+# (seq, depth_h, depth_w, len_rgb, depth_codec, depth_shift).
+# Die Tiefe ist immer uint16; ein struct.pack ersetzt das JSON-Encode pro Frame.
+FRAME_HEADER = struct.Struct("<IHHIBB")
+
+# Kompaktes Binärformat für Resultpakete: Magic + Timestamp (f64) + Pose
+# (16x f32) + Boxpunkte (8x2 i16 Pixelkoordinaten). Ältere Server schicken
+# weiterhin gepickelte Dicts; der Empfänger erkennt das Format am Präfix.
+RESULT_MAGIC = b"PB1"
+RESULT_PACKET = struct.Struct("<d16f16h")
+
+# Optionale Tiefenquantisierung: MTFPL_DEPTH_SHIFT=n verwirft die untersten
+# n Bits (bei Z16 in mm: n=1 -> 2-mm-Schritte). Die gröberen Werte sind für
+# zlib/lz4 deutlich kompressibler; der Server rekonstruiert per Linksshift
+# aus dem Headerfeld.
+DEPTH_SHIFT = max(0, int(os.environ.get("MTFPL_DEPTH_SHIFT", "0")))
+
+# Tiefenkompression: LZ4 im Block-Modus erreicht auf Z16-Daten ein Vielfaches
+# des zlib-level-1-Durchsatzes; ohne installiertes lz4 bleibt zlib der Fallback.
+try:
+    import lz4.block as _lz4block
+except ImportError:
+    _lz4block = None
+
+# Zstd (Level 1) liegt auf Z16-Daten um ein Mehrfaches über zlib-1 bei
+# gleicher oder besserer Ratio; das Kompressorobjekt wird wiederverwendet.
+try:
+    import zstandard
+    _zstd_compressor = zstandard.ZstdCompressor(level=1, threads=0)
+except ImportError:
+    _zstd_compressor = None
+
+# Blosc2 mit Bitshuffle nutzt die Oberbyte-Redundanz der uint16-Tiefe aus
+# (typesize=2) und komprimiert multithreaded; beste Ratio/Durchsatz-Kombi,
+# wenn installiert.
+try:
+    import blosc2 as _blosc2
+except ImportError:
+    _blosc2 = None
+
+DEPTH_CODEC_ZLIB = 0
+DEPTH_CODEC_LZ4 = 1
+DEPTH_CODEC_ZVC = 2
+DEPTH_CODEC_ZSTD = 3
+DEPTH_CODEC_BLOSC = 4
+DEPTH_CODEC_NONE = 5
+
+# Codec per MTFPL_DEPTH_CODEC festnageln (none|zvc|blosc|zstd|lz4|zlib);
+# ohne Angabe gilt die Präferenzfolge ZVC -> blosc -> zstd -> lz4 -> zlib
+# je nach Verfügbarkeit. "none" schickt rohes Z16 — auf Gbit-LAN kostet
+# das ~2 ms Leitung und null Encode-CPU.
+_DEPTH_CODEC_PREF = os.environ.get("MTFPL_DEPTH_CODEC", "").lower()
+
+def _compress_depth_zvc(depth_img):
+    # Zero-Value-Compression: Bitmaske der gültigen Pixel + die Nicht-Null-
+    # Werte am Stück. RealSense-Tiefenbilder haben große Invalid-Regionen,
+    # und die zwei vektorisierten NumPy-Pässe ersetzen die DEFLATE-Schleife
+    # komplett. Der Decoder rekonstruiert aus (shape, maske, werte).
+    mask = depth_img != 0
+    # Bei (fast) vollständig gültigen Frames würde ZVC expandieren ->
+    # None signalisiert dem Aufrufer den Fallback-Codec
+    if 2 * int(np.count_nonzero(mask)) + depth_img.size // 8 >= depth_img.nbytes:
+        return None
+    packed_mask = np.packbits(mask.ravel())
+    nz = depth_img[mask]
+    return b"".join((packed_mask.tobytes(), nz.tobytes()))
+
+# JPEG-Encode: PyTurboJPEG spricht libjpeg-turbo direkt an und ist auf
+# 640x480 BGR8 deutlich schneller als cv2.imencode; ohne installierte
+# Bibliothek bleibt OpenCV der Fallback.
+try:
+    from turbojpeg import TurboJPEG, TJFLAG_FASTDCT
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+# Optionales JPEG-XL für den RGB-Anteil (MTFPL_RGB_CODEC=jxl): bei ähnlichem
+# CPU-Einsatz deutlich kleinere Frames; der Server erkennt das Format am
+# Magic-Byte. Nur aktiv, wenn imagecodecs mit libjxl installiert ist.
+_RGB_CODEC = os.environ.get("MTFPL_RGB_CODEC", "").lower()
+try:
+    from imagecodecs import jpegxl_encode as _jxl_encode
+except ImportError:
+    _jxl_encode = None
+
+def encode_jpeg(bgr_img, quality=90):
+    """Kodiert ein BGR-Bild als JPEG (oder JPEG-XL), Rückgabe bytes-artiger Puffer."""
+    if _RGB_CODEC == "jxl" and _jxl_encode is not None:
+        # distance 1.0 ~ visuell verlustfrei, effort 3 = Echtzeit-Preset
+        return _jxl_encode(cv2.cvtColor(bgr_img, cv2.COLOR_BGR2RGB),
+                           distance=1.0, effort=3)
+    if _turbojpeg is not None:
+        # FASTDCT: leicht ungenauere, aber deutlich schnellere DCT — für
+        # einen Q90-Livestream visuell irrelevant
+        return _turbojpeg.encode(bgr_img, quality=quality, flags=TJFLAG_FASTDCT)
+    _, buf = cv2.imencode('.jpg', bgr_img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return buf
+
+def compress_depth(depth_img):
+    """Komprimiert den Tiefenpuffer, Rückgabe (codec_id, bytes)."""
+    pref = _DEPTH_CODEC_PREF
+    if pref == "none":
+        return DEPTH_CODEC_NONE, memoryview(depth_img)
+    if pref in ("", "zvc"):
+        zvc = _compress_depth_zvc(depth_img)
+        if zvc is not None:
+            return DEPTH_CODEC_ZVC, zvc
+    # Alle Codecs akzeptieren das Buffer-Protokoll direkt; das spart
+    # die tobytes()-Kopie des kompletten Tiefenpuffers pro Frame
+    if _blosc2 is not None and pref in ("", "zvc", "blosc"):
+        return DEPTH_CODEC_BLOSC, _blosc2.compress2(
+            depth_img, codec=_blosc2.Codec.LZ4, clevel=1,
+            filter=_blosc2.Filter.BITSHUFFLE, typesize=2)
+    if _zstd_compressor is not None and pref in ("", "zvc", "zstd"):
+        return DEPTH_CODEC_ZSTD, _zstd_compressor.compress(depth_img)
+    if _lz4block is not None and pref != "zlib":
+        return DEPTH_CODEC_LZ4, _lz4block.compress(
+            depth_img, mode="fast", acceleration=8, store_size=False)
+    return DEPTH_CODEC_ZLIB, zlib.compress(depth_img, level=1)
+
+class FrameRing:
+    # Kleiner SPSC-Ring mit vorallokierten Slots zwischen Capture- und
+    # Encoder-Thread. Der Produzent blockiert nie: bei Überlauf werden die
+    # ältesten Frames übersprungen (gleiche Semantik wie CONFLATE am Socket).
+    SLOTS = 4
+
+    def __init__(self):
+        self._slots = [None] * self.SLOTS
+        self._write_seq = 0
+        self._read_seq = 0
+        self._cond = threading.Condition()
+
+    def put(self, cv_img, depth_img):
+        idx = self._write_seq & (self.SLOTS - 1)
+        slot = self._slots[idx]
+        if (slot is None or slot[0].shape != cv_img.shape
+                or slot[1].shape != depth_img.shape):
+            slot = (np.empty_like(cv_img), np.empty_like(depth_img))
+            self._slots[idx] = slot
+        np.copyto(slot[0], cv_img)
+        np.copyto(slot[1], depth_img)
+        with self._cond:
+            self._write_seq += 1
+            self._cond.notify()
+
+    def get(self, timeout=0.5):
+        with self._cond:
+            if self._read_seq == self._write_seq:
+                self._cond.wait(timeout)
+            if self._read_seq == self._write_seq:
+                return None
+            # Rückstand? Dann direkt zum neuesten Frame springen
+            if self._write_seq - self._read_seq > 1:
+                self._read_seq = self._write_seq - 1
+            idx = self._read_seq & (self.SLOTS - 1)
+            self._read_seq += 1
+            return self._slots[idx]
+
+class EncoderThread(QThread):
+    # Konsument des FrameRing: JPEG/zlib bzw. Hardware-Encode und der
+    # ZMQ-Versand laufen hier, damit wait_for_frames() im Capture-Loop nie
+    # hinter dem Encoder herhinkt
+    def __init__(self, camera_thread):
+        super().__init__()
+        self._cam = camera_thread
+        self._run_flag = True
+        self._error_reported = False
+
+    def run(self):
+        while self._run_flag:
+            item = self._cam._frame_ring.get(timeout=0.5)
+            if item is None:
+                continue
+            try:
+                self._cam._encode_and_send(item[0], item[1])
+            except Exception as e:
+                # Encoder-Fehler dürfen den Thread nicht still beenden —
+                # loggen, einmalig an die GUI melden und weitermachen
+                print(f"[ERROR] Encoder: {e}")
+                if not self._error_reported:
+                    self._error_reported = True
+                    self._cam.connection_error_signal.emit(f"Encoder Fehler: {e}")
+
+    def stop(self):
+        self._run_flag = False
+        self.wait()
+
+class _HwVideoEncoder:
+    # Optionaler H.264-Hardware-Encode (NVENC, dann AMF/QSV) über PyAV,
+    # aktivierbar per MTFPL_HWENC=1. Ersetzt den CPU-JPEG-Pfad für den
+    # Farbstream; Tiefe bleibt auf dem bestehenden Kompressionspfad, da sie
+    # kein natürlicher Videocodec-Input ist.
+    _CODECS = ("h264_nvenc", "h264_amf", "h264_qsv")
+
+    def __init__(self, av_module, ctx):
+        self._av = av_module
+        self._ctx = ctx
+
+    @classmethod
+    def create(cls, width, height, fps=60):
+        try:
+            import av
+        except ImportError:
+            print("[CLIENT] PyAV nicht installiert, Hardware-Encode deaktiviert.")
+            return None
+        for codec_name in cls._CODECS:
+            try:
+                codec = av.codec.Codec(codec_name, "w")
+                ctx = codec.create()
+                ctx.width = width
+                ctx.height = height
+                ctx.pix_fmt = "yuv420p"
+                ctx.bit_rate = 8_000_000
+                ctx.options = {"preset": "p1", "tune": "ull", "zerolatency": "1"}
+                ctx.open()
+                print(f"[CLIENT] Hardware-Encoder aktiv: {codec_name}")
+                return cls(av, ctx)
+            except Exception as e:
+                print(f"[CLIENT] {codec_name} nicht nutzbar: {e}")
+        return None
+
+    def encode(self, bgr_img):
+        frame = self._av.VideoFrame.from_ndarray(bgr_img, format="bgr24")
+        return [bytes(pkt) for pkt in self._ctx.encode(frame)]
 
 class CameraThread(QThread):
-    change_pixmap_signal = pyqtSignal(QImage)
     connection_error_signal = pyqtSignal(str)
     intrinsics_signal = pyqtSignal(object)
 
     def __init__(self, server_ip):
         super().__init__()
         self._run_flag = True
-        self.tracking_active = False 
+        self.tracking_active = False
         self.server_ip = server_ip
+        # Neuester Frame für die GUI; der Render-Timer holt ihn ab, alte
+        # Frames werden einfach überschrieben
+        self.frame_queue = deque(maxlen=1)
         
-        self.context = zmq.Context()
-        self.video_socket = self.context.socket(zmq.PUSH) 
+        self.context = zmq.Context.instance()
+        self.video_socket = self.context.socket(zmq.PUSH)
+        # CONFLATE = echtes "nur der neueste Frame zählt" (SNDHWM=1 würde trotzdem puffern)
+        self.video_socket.setsockopt(zmq.CONFLATE, 1)
+        # IMMEDIATE: ohne verbundenen Server nicht in die Warteschlange stauen
+        self.video_socket.setsockopt(zmq.IMMEDIATE, 1)
+        # 4 MB Kernel-Sendepuffer: die Linux-Defaults liegen z.T. unter einer
+        # einzelnen RGB+Tiefe-Nutzlast und würden Bursts ausbremsen
+        self.video_socket.setsockopt(zmq.SNDBUF, 4 * 1024 * 1024)
         self.video_socket.connect(f"tcp://{self.server_ip}:5556")
-        self.video_socket.setsockopt(zmq.SNDHWM, 1) 
         
+        # Doppelpuffer: keine Frame-Allokationen im Capture-Loop; der jeweils
+        # inaktive Puffer bleibt für den asynchronen ZMQ-Versand gültig
+        self._rgb_buf = [np.empty((480, 640, 3), np.uint8) for _ in range(2)]
+        # Tiefe wird vor dem Versand 2x dezimiert (siehe run_realsense)
+        self._depth_buf = [np.empty((240, 320), np.uint16) for _ in range(2)]
+        self._buf_idx = 0
+
         self.cam_type = None
         self.rs_pipeline = None
         self.zivid_app = None
         self.zivid_camera = None
 
+        self._shm_rgb = None
+        self._shm_depth = None
+        self._shm_seq = 0
+        self._init_shared_memory()
+
+        self._hw_enc = None
+        self._hw_socket = None
+        if os.environ.get("MTFPL_HWENC") == "1":
+            self._hw_enc = _HwVideoEncoder.create(640, 480)
+            if self._hw_enc is not None:
+                # H.264 ist zustandsbehaftet: eigener PUSH ohne CONFLATE,
+                # damit keine Codec-Pakete verworfen werden
+                self._hw_socket = self.context.socket(zmq.PUSH)
+                self._hw_socket.setsockopt(zmq.SNDHWM, 4)
+                self._hw_socket.connect(f"tcp://{self.server_ip}:5556")
+
+        self._send_seq = 0
+        self._depth_shift_buf = None
+        self._frame_ring = FrameRing()
+        self._encoder = EncoderThread(self)
+        self._encoder.start()
+
+    def _init_shared_memory(self):
+        # Läuft der Server auf demselben Rechner, spart Shared Memory die
+        # beiden Kernel-Kopien des TCP-Loopback-Pfads; über ZMQ geht dann nur
+        # noch eine kleine "Frame bereit"-Nachricht
+        if self.server_ip not in ("127.0.0.1", "localhost"):
+            return
+        try:
+            from multiprocessing import shared_memory
+            self._shm_rgb = shared_memory.SharedMemory(
+                create=True, size=640 * 480 * 3, name="mtfpl_rgb")
+            self._shm_depth = shared_memory.SharedMemory(
+                create=True, size=640 * 480 * 2, name="mtfpl_depth")
+            print("[CLIENT] Shared-Memory-Transport aktiv (lokaler Server).")
+        except Exception as e:
+            print(f"[CLIENT] Shared Memory nicht verfügbar, nutze TCP: {e}")
+            self._shm_rgb = None
+            self._shm_depth = None
+
     def detect_camera(self):
         try:
             rs_ctx = rs.context()
@@ -216,6 +613,7 @@ class CameraThread(QThread):
     def run(self):
         if not self.detect_camera():
             self.connection_error_signal.emit("Keine unterstützte Kamera (RealSense oder Zivid) gefunden.")
+            self.cleanup()
             return
 
         if self.cam_type == "realsense":
@@ -229,22 +627,42 @@ class CameraThread(QThread):
         config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8, 60)
         config.enable_stream(rs.stream.depth, 640, 480, rs.format.z16, 60)
         align = rs.align(rs.stream.color)
-        
+        # Z16 bei voller Auflösung sind ~600 KB/Frame; der Server subsampled
+        # ohnehin -> Dezimierung spart ~75% Bandbreite auf dem Tiefenkanal
+        decimate = rs.decimation_filter(2)
+        # frame_queue(1) als Callback-Senke statt wait_for_frames: die interne
+        # Sync-Queue der Pipeline entfällt, es liegt immer höchstens das
+        # neueste Frameset an (minimale Capture-Latenz, alte Frames fallen weg)
+        frame_q = rs.frame_queue(1)
+
         try:
-            profile = self.rs_pipeline.start(config)
+            profile = self.rs_pipeline.start(config, frame_q)
             intr = profile.get_stream(rs.stream.color).as_video_stream_profile().get_intrinsics()
             K = np.array([[intr.fx, 0, intr.ppx], [0, intr.fy, intr.ppy], [0, 0, 1]])
             self.intrinsics_signal.emit(K)
-            
+
+            # Aufwärmen: die ersten Frames nach dem Start kommen mit ~500 ms
+            # Verzögerung und instabiler Belichtung — wegwerfen statt anzeigen
+            for _ in range(5):
+                if not self._run_flag:
+                    break
+                frame_q.wait_for_frame()
+
             while self._run_flag:
-                frames = self.rs_pipeline.wait_for_frames()
+                frames = rs.composite_frame(frame_q.wait_for_frame())
                 aligned_frames = align.process(frames)
                 color_frame = aligned_frames.get_color_frame()
                 depth_frame = aligned_frames.get_depth_frame()
                 if not color_frame or not depth_frame: continue
-                
-                cv_img = np.asanyarray(color_frame.get_data())
-                depth_img = np.asanyarray(depth_frame.get_data())
+                depth_frame = decimate.process(depth_frame)
+
+                self._buf_idx ^= 1
+                cv_img = self._rgb_buf[self._buf_idx]
+                depth_img = self._depth_buf[self._buf_idx]
+                # frombuffer statt asanyarray: nur ein View auf den SDK-Puffer,
+                # kopiert wird genau einmal in unseren Doppelpuffer
+                np.copyto(cv_img, np.frombuffer(color_frame.get_data(), np.uint8).reshape(cv_img.shape))
+                np.copyto(depth_img, np.frombuffer(depth_frame.get_data(), np.uint16).reshape(depth_img.shape))
                 
                 self.process_and_send_frames(cv_img, depth_img)
                 
@@ -308,75 +726,248 @@ class CameraThread(QThread):
 
     def process_and_send_frames(self, cv_img, depth_img):
         if self.tracking_active:
+            # Nur in den Ring kopieren; Encode + Versand übernimmt der
+            # EncoderThread, der Capture-Loop läuft sofort weiter
+            self._frame_ring.put(cv_img, depth_img)
+
+        # Das BGR-Array wandert unkopiert zur GUI; das QImage entsteht erst dort
+        # als Format_BGR888-View und QPixmap.fromImage detacht sofort. Der
+        # Doppelpuffer bzw. das Resize-Ergebnis bleibt bis dahin gültig.
+        self.frame_queue.append(cv_img)
+
+    def _encode_and_send(self, cv_img, depth_img):
+        if self._shm_rgb is not None:
+            # Lokaler Server: rohe Frames in den Shared-Memory-Block schreiben,
+            # JPEG/zlib entfallen komplett
             try:
-                encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90] 
-                _, rgb_encoded = cv2.imencode('.jpg', cv_img, encode_param)
-                depth_compressed = zlib.compress(depth_img.tobytes(), level=1)
-                
-                payload = {
-                    "rgb_compressed": rgb_encoded, 
-                    "depth_compressed": depth_compressed, 
-                    "shape": depth_img.shape, 
+                np.copyto(np.ndarray(cv_img.shape, np.uint8, buffer=self._shm_rgb.buf), cv_img)
+                np.copyto(np.ndarray(depth_img.shape, np.uint16, buffer=self._shm_depth.buf), depth_img)
+                self._shm_seq += 1
+                notify = json.dumps({
+                    "shm": [self._shm_rgb.name, self._shm_depth.name],
+                    "seq": self._shm_seq,
+                    "shape_rgb": cv_img.shape,
+                    "shape": depth_img.shape,
                     "dtype": str(depth_img.dtype)
-                }
-                self.video_socket.send_pyobj(payload, flags=zmq.NOBLOCK)
-            except zmq.Again: 
-                pass 
-
-        rgb_image = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_img = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-        
-        p = qt_img.scaled(640, 480, Qt.AspectRatioMode.IgnoreAspectRatio)
-        self.change_pixmap_signal.emit(p)
+                }).encode()
+                self.video_socket.send(notify, flags=zmq.NOBLOCK)
+            except zmq.Again:
+                pass
+        elif self._hw_enc is not None:
+            try:
+                for pkt in self._hw_enc.encode(cv_img):
+                    self._hw_socket.send_multipart([b"v", pkt], flags=zmq.NOBLOCK)
+                codec, depth_compressed = compress_depth(depth_img)
+                hdr = json.dumps({
+                    "shape": depth_img.shape,
+                    "dtype": str(depth_img.dtype),
+                    "codec": codec
+                }).encode()
+                self._hw_socket.send_multipart([b"d", hdr, depth_compressed],
+                                               flags=zmq.NOBLOCK)
+            except zmq.Again:
+                pass
+            except Exception as e:
+                print(f"[CLIENT] Hardware-Encode Fehler, Fallback auf JPEG: {e}")
+                self._hw_enc = None
+        else:
+            try:
+                rgb_encoded = memoryview(encode_jpeg(cv_img))
+                if DEPTH_SHIFT:
+                    if (self._depth_shift_buf is None
+                            or self._depth_shift_buf.shape != depth_img.shape):
+                        self._depth_shift_buf = np.empty_like(depth_img)
+                    np.right_shift(depth_img, DEPTH_SHIFT, out=self._depth_shift_buf)
+                    depth_img = self._depth_shift_buf
+                codec, depth_compressed = compress_depth(depth_img)
+
+                # Fester Binärheader statt pickle/JSON. CONFLATE erlaubt kein
+                # Multipart, daher ein einzelner Frame: [FRAME_HEADER][jpg][depth]
+                self._send_seq += 1
+                header = FRAME_HEADER.pack(self._send_seq,
+                                           depth_img.shape[0], depth_img.shape[1],
+                                           rgb_encoded.nbytes, codec, DEPTH_SHIFT)
+                msg = b"".join((header, rgb_encoded, depth_compressed))
+                self.video_socket.send(msg, flags=zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                pass
 
     def cleanup(self):
+        # Encoder zuerst anhalten, er benutzt die Sockets
+        self._encoder.stop()
         self.video_socket.close()
-        self.context.term()
+        if self._hw_socket is not None:
+            self._hw_socket.close()
+        for shm in (self._shm_rgb, self._shm_depth):
+            if shm is not None:
+                try:
+                    shm.close(); shm.unlink()
+                except Exception:
+                    pass
 
     def stop(self):
         self._run_flag = False
         self.wait()
 
+class CadUploadWorker(QThread):
+    upload_done = pyqtSignal(bool)
+
+    def __init__(self, server_ip, frames, parent=None, mmaps=()):
+        super().__init__(parent)
+        self.server_ip = server_ip
+        self.frames = frames
+        # Gemappte Dateien bleiben bis nach dem Versand offen (zero-copy)
+        self._mmaps = mmaps
+
+    def run(self):
+        # Eigener REQ-Socket: ZMQ-Sockets sind nicht threadsafe, und der
+        # Upload soll die GUI nicht für die Dauer des recv blockieren
+        sock = zmq.Context.instance().socket(zmq.REQ)
+        sock.setsockopt(zmq.RCVTIMEO, 60000)
+        sock.setsockopt(zmq.LINGER, 0)
+        sock.connect(f"tcp://{self.server_ip}:5555")
+        try:
+            sock.send_multipart(self.frames, copy=False)
+            sock.recv_string()
+            self.upload_done.emit(True)
+        except Exception as e:
+            print(f"Upload Fehler: {e}")
+            self.upload_done.emit(False)
+        finally:
+            sock.close()
+            self.frames = None
+            for mm in self._mmaps:
+                try:
+                    mm.close()
+                except (BufferError, ValueError):
+                    pass
+
+class _TextureListWorker(QThread):
+    # Holt GET_TEXTURES im Hintergrund, damit der Dialog aus dem Cache sofort
+    # öffnen kann, ohne dass Änderungen auf dem Server verloren gehen
+    list_ready = pyqtSignal(list)
+
+    def __init__(self, server_ip, parent=None):
+        super().__init__(parent)
+        self.server_ip = server_ip
+
+    def run(self):
+        sock = zmq.Context.instance().socket(zmq.REQ)
+        sock.setsockopt(zmq.RCVTIMEO, 10000)
+        sock.setsockopt(zmq.LINGER, 0)
+        sock.connect(f"tcp://{self.server_ip}:5555")
+        try:
+            sock.send_pyobj({"cmd": "GET_TEXTURES"})
+            response = sock.recv_pyobj()
+            if response.get("status") == "OK":
+                textures = sorted(response.get("textures", []),
+                                  key=lambda x: x['name'].lower())
+                self.list_ready.emit(textures)
+        except Exception as e:
+            print(f"[CLIENT] Textur-Refresh fehlgeschlagen: {e}")
+        finally:
+            sock.close()
+
+class _MeshLoader(QThread):
+    mesh_ready = pyqtSignal(object)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self._file_path = file_path
+
+    def run(self):
+        try:
+            mesh = pv.read(self._file_path)
+            # Für die Vorschau reicht eine reduzierte Auflösung (~50k Zellen),
+            # dann bleibt auch das Shading großer OBJs flüssig
+            if mesh.n_cells > 50000:
+                try:
+                    target = 1.0 - 50000 / mesh.n_cells
+                    mesh = mesh.triangulate().decimate_pro(target)
+                except Exception as e:
+                    print(f"[WARN] Preview-Dezimierung fehlgeschlagen: {e}")
+            self.mesh_ready.emit(mesh)
+        except Exception as e:
+            self.load_failed.emit(str(e))
+
 class CADPreviewWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
-        self.plotter = QtInteractor(self)
-        self.layout.addWidget(self.plotter.interactor)
-        self.plotter.set_background("#000000") 
-        self.plotter.view_isometric()
-        
+        # QtInteractor (VTK/OpenGL) erst beim ersten Mesh erzeugen -> spart
+        # mehrere hundert ms Kaltstart und GL-Arbeit solange kein CAD geladen ist
+        self.plotter = None
+        self._placeholder = QLabel("No CAD loaded")
+        self._placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._placeholder.setStyleSheet("background-color: #000000; color: #777777;")
+        self.layout.addWidget(self._placeholder)
+
         self.mesh_actor = None
         self.current_mesh = None
+        self._loader = None
+        self._pending_color = None
+        self._pending_texture = None
+        self._last_color_hex = None
 
     def load_mesh(self, file_path, initial_qcolor=None):
+        # pv.read kann auf großen OBJs Sekunden blockieren -> Worker-Thread
+        self._pending_color = initial_qcolor
+        self._loader = _MeshLoader(file_path, self)
+        self._loader.mesh_ready.connect(self._on_mesh_ready)
+        self._loader.load_failed.connect(
+            lambda msg: print(f"[ERROR] CAD Preview: {msg}"))
+        self._loader.start()
+
+    def _ensure_plotter(self):
+        if self.plotter is not None:
+            return
+        self.plotter = QtInteractor(self)
+        self.plotter.set_background("#000000")
+        self.plotter.view_isometric()
+        self.layout.replaceWidget(self._placeholder, self.plotter.interactor)
+        self._placeholder.deleteLater()
+        self._placeholder = None
+
+    def _on_mesh_ready(self, mesh):
         try:
+            self._ensure_plotter()
             self.plotter.clear()
-            self.current_mesh = pv.read(file_path)
-            
-            c = initial_qcolor.name() if initial_qcolor else "lightgrey"
-            
+            self.current_mesh = mesh
+
+            c = self._pending_color.name() if self._pending_color else "lightgrey"
+
             self.mesh_actor = self.plotter.add_mesh(
-                self.current_mesh, 
-                color=c, 
+                mesh,
+                color=c,
                 smooth_shading=True,
                 specular=0.5
             )
             self.plotter.reset_camera()
             self.plotter.render()
+            if self._pending_texture is not None:
+                tex, self._pending_texture = self._pending_texture, None
+                self.update_texture(tex)
         except Exception as e:
             print(f"[ERROR] CAD Preview: {e}")
 
     def update_color(self, qcolor):
         if self.mesh_actor:
+            # Unveränderte Farbe -> kein redundanter Render-Submit
+            if (self.mesh_actor.texture is None
+                    and qcolor.name() == self._last_color_hex):
+                return
+            self._last_color_hex = qcolor.name()
             self.mesh_actor.texture = None
             self.mesh_actor.prop.color = qcolor.name()
             self.plotter.render()
 
     def update_texture(self, texture_bytes):
+        if texture_bytes and self.mesh_actor is None:
+            # Mesh lädt noch im Worker -> Textur vormerken
+            self._pending_texture = texture_bytes
+            return
         if self.mesh_actor and texture_bytes and self.current_mesh:
             try:
                 nparr = np.frombuffer(texture_bytes, np.uint8)
@@ -407,6 +998,14 @@ class CADPreviewWidget(QWidget):
                 print(f"[ERROR] Preview Texture Error: {e}")
 
 class ClientApp(QMainWindow):
+    # Kanten der 3D-Bounding-Box (Indizes in die 8 projizierten Eckpunkte)
+    _BOX_EDGES = np.array([[0,1], [1,3], [3,2], [2,0], [4,5], [5,7], [7,6], [6,4],
+                           [0,4], [1,5], [2,6], [3,7]], dtype=np.int32)
+    _POSE_LOG_DTYPE = np.dtype([("id", "<u4"), ("ts", "<f8"), ("pose", "<f8", (4, 4))])
+    # Ursprung + Achsenenden (10 cm) homogen als Spalten für die Projektion
+    _AXIS_PTS = np.array([[0, 0, 0, 1], [0.1, 0, 0, 1],
+                          [0, 0.1, 0, 1], [0, 0, 0.1, 1]], dtype=np.float64).T
+
     def __init__(self, server_ip):
         super().__init__()
         self.server_ip = server_ip 
@@ -455,17 +1054,29 @@ class ClientApp(QMainWindow):
 
         self.current_box_points = None
         self.current_pose = None
+        # Vorprojizierte Overlay-Linien: werden nur bei Pose-Updates neu
+        # gebaut (Trackingrate), nicht bei jedem Repaint (30 Hz)
+        self._box_lines = None
+        self._axis_lines = None
         self.K = None
-        self.tracking_fps_buffer = deque()
+        # FPS über einen festen 64er-Zeitstempelring: O(1) pro Paket statt
+        # popleft-Schleife; der Vergleich über 64 Floats ist ein SIMD-Durchlauf
+        self._ts_ring = np.zeros(64, np.float64)
+        self._ts_seq = 0
         self.tracking_fps = 0
-        self.pose_log = []      
+        # Pose-Log als vorbelegtes strukturiertes Array: ein Eintrag ist ein
+        # Slot-Write statt Dict-Allokation, gewachsen wird in Blöcken
+        self.pose_log = np.zeros(4096, dtype=self._POSE_LOG_DTYPE)
+        self._pose_log_n = 0
         self.image_counter = 0
         self.texture_cache = None
+        self._texture_refresh = None
 
-        self.context = zmq.Context()
+        self.context = zmq.Context.instance()
         self.cmd_socket = self.context.socket(zmq.REQ)
-        self.cmd_socket.connect(f"tcp://{self.server_ip}:5555")
         self.cmd_socket.setsockopt(zmq.RCVTIMEO, 60000)
+        self.cmd_socket.setsockopt(zmq.LINGER, 0)
+        self.cmd_socket.connect(f"tcp://{self.server_ip}:5555")
 
         self.status_cad = False
         self.status_appearance = False 
@@ -473,6 +1084,23 @@ class ClientApp(QMainWindow):
         self.drawing_mode = False
         self.mask_points = []
         self.mask_color = QColor(255, 255, 255, 255)
+        # Halbtransparente Füllfarbe einmal pro Farbwahl ableiten, nicht
+        # bei jedem Overlay-Rebuild
+        self._mask_fill = QColor(self.mask_color)
+        self._mask_fill.setAlpha(100)
+        self._overlay_pixmap = None
+        self._overlay_dirty = True
+        self._last_frame_arr = None
+        self._aligned_buf = None
+
+        # Zeichenobjekte des Render-Pfads einmalig anlegen; jede QPen/QFont-
+        # Konstruktion kostet sonst einen PyQt->C++-Übergang pro Frame
+        self._box_pen = QPen(QColor(0, 255, 0), 2)
+        self._axis_pens = (QPen(QColor(255, 0, 0), 3),
+                           QPen(QColor(0, 255, 0), 3),
+                           QPen(QColor(0, 0, 255), 3))
+        self._fps_pen = QPen(QColor("yellow"))
+        self._fps_font = QFont("Arial", 14, QFont.Weight.Bold)
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -486,6 +1114,13 @@ class ClientApp(QMainWindow):
         self.image_label.setFixedSize(640, 480)
         self.image_label.setStyleSheet("border: 2px solid white; background-color: #000;")
         self.image_label.on_click.connect(self.handle_image_click)
+        self.image_label.paint_overlay = self._draw_overlay
+        self.image_label.overlay_visible = self._overlay_visible
+        # Konstanten des Render-Pfads einmal binden: der Format-Enum-Lookup
+        # und die Methodenauflösungen kosten sonst pro Frame
+        self._qimg_fmt = QImage.Format.Format_BGR888
+        self._pixmap_from_image = QPixmap.fromImage
+        self._set_pixmap = self.image_label.setPixmap
         self.left_layout.addWidget(self.image_label)
 
         self.logo_label = QLabel()
@@ -551,14 +1186,19 @@ class ClientApp(QMainWindow):
         self.main_layout.addWidget(self.left_container)
         self.main_layout.addLayout(self.sidebar_layout)
 
+        # Renderrate von der Aufnahmerate entkoppeln: die Worker legen nur den
+        # neuesten Stand in ihren Deques ab, ein 30-Hz-Timer holt ab und
+        # zeichnet ("latest wins") — kein Signal-Marshalling pro Frame
+        self._render_timer = QTimer(self)
+        self._render_timer.timeout.connect(self._drain_frame)
+        self._render_timer.start(33)
+
         self.thread = CameraThread(self.server_ip)
-        self.thread.change_pixmap_signal.connect(self.update_image)
         self.thread.connection_error_signal.connect(self.show_camera_error)
         self.thread.intrinsics_signal.connect(self.set_intrinsics)
         self.thread.start()
 
         self.result_receiver = ResultReceiver(self.server_ip)
-        self.result_receiver.new_result.connect(self.update_box_points) 
         self.result_receiver.start()
 
     def show_camera_error(self, msg):
@@ -579,11 +1219,14 @@ class ClientApp(QMainWindow):
     def toggle_tracking(self):
         self.current_box_points = None
         self.current_pose = None
+        self._box_lines = None
+        self._axis_lines = None
 
         if not self.thread.tracking_active:
-            self.pose_log = []      
-            self.image_counter = 0 
-            self.tracking_fps_buffer.clear()
+            self._pose_log_n = 0
+            self.image_counter = 0
+            self._ts_ring[:] = 0.0
+            self._ts_seq = 0
             self.tracking_fps = 0
             
             self.btn_log.setEnabled(False) 
@@ -605,6 +1248,8 @@ class ClientApp(QMainWindow):
             print("[CLIENT] Resetting Mask State...")
             self.status_mask = False
             self.mask_points = []
+            self._overlay_dirty = True
+            self.image_label.update()
             self.btn_mask.setText("3. ✏️ Draw Mask")
             
             self.check_ready_status()
@@ -628,60 +1273,68 @@ class ClientApp(QMainWindow):
             has_auto_texture = os.path.exists(mtl_path) and os.path.exists(png_path)
 
             try:
-                with open(file_path, "rb") as f: 
-                    obj_data = f.read()
+                # OBJ per mmap statt read(): das Modell wird nicht erst
+                # komplett in den Python-Heap kopiert, ZMQ sendet direkt
+                # aus dem Page-Cache
+                with open(file_path, "rb") as f:
+                    obj_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
                 filename = os.path.basename(file_path)
 
-                # 2. Payload abhängig vom Vorhandensein der Textur bauen
+                # 2. Multipart-Frames abhängig vom Vorhandensein der Textur bauen
+                #    (kein pickle: Kommando, Dateiname und Blobs als rohe Frames)
+                self._upload_png = None
                 if has_auto_texture:
                     with open(mtl_path, "rb") as f: mtl_data = f.read()
                     with open(png_path, "rb") as f: png_data = f.read()
-                    
-                    payload = {
-                        "cmd": "UPLOAD_CAD_BUNDLE", 
-                        "filename": filename,
-                        "obj_data": obj_data,
-                        "mtl_data": mtl_data,
-                        "png_data": png_data
-                    }
+                    self._upload_png = png_data
+                    frames = [b"UPLOAD_CAD_BUNDLE", filename.encode(),
+                              obj_data, mtl_data, png_data]
                 else:
-                    payload = {
-                        "cmd": "UPLOAD_CAD", 
-                        "filename": filename,
-                        "data": obj_data
-                    }
-
-                # 3. An Server senden
-                self.cmd_socket.send_pyobj(payload)
-                self.cmd_socket.recv_string()
-                
-                # 4. UI Updates
-                self.btn_cad.setText("✅ CAD Uploaded")
-                self.status_cad = True
-                
-                if has_auto_texture:
-                    # Direkte Vorschau im Client und UI-Freischaltung
-                    self.cad_preview.update_texture(png_data)
-                    self.btn_texture.setText("✅ Auto-Texture")
-                    self.status_appearance = True
+                    frames = [b"UPLOAD_CAD", filename.encode(), obj_data]
 
-                self.check_ready_status()
+                # 3. Senden im Worker-Thread, damit die GUI bedienbar bleibt
+                self._upload_worker = CadUploadWorker(self.server_ip, frames, self,
+                                                      mmaps=(obj_data,))
+                self._upload_worker.upload_done.connect(self._on_cad_uploaded)
+                self._upload_worker.start()
 
             except Exception as e:
                 print(f"Upload Fehler: {e}")
                 self.btn_cad.setText("❌ Upload Failed")
 
+    def _on_cad_uploaded(self, ok):
+        if not ok:
+            self.btn_cad.setText("❌ Upload Failed")
+            return
+        self.btn_cad.setText("✅ CAD Uploaded")
+        self.status_cad = True
+
+        if self._upload_png is not None:
+            # Direkte Vorschau im Client und UI-Freischaltung
+            self.cad_preview.update_texture(self._upload_png)
+            self.btn_texture.setText("✅ Auto-Texture")
+            self.status_appearance = True
+
+        self.check_ready_status()
+
     def handle_image_click(self, x, y):
         if not self.drawing_mode: return
         self.mask_points.append((x, y))
+        self._overlay_dirty = True
+        self.image_label.update()
         if len(self.mask_points) == 1:
             self.btn_mask.setText("Click Point 2...")
         elif len(self.mask_points) == 2:
             self.drawing_mode = False
             self.btn_mask.setText("✅ Mask Ready")
-            profile = self.thread.pipeline.get_active_profile()
-            intr = profile.get_stream(rs.stream.color).as_video_stream_profile().get_intrinsics()
-            K = [[intr.fx, 0, intr.ppx], [0, intr.fy, intr.ppy], [0, 0, 1]]
+            # Intrinsics sind nach dem Pipeline-Start konstant und kommen
+            # bereits per intrinsics_signal -> kein librealsense-Zugriff aus
+            # dem GUI-Thread mehr nötig
+            if self.K is None:
+                print("[ERROR] Keine Kamera-Intrinsics vorhanden.")
+                self.btn_mask.setText("❌ No Intrinsics")
+                return
+            K_list = self.K.tolist()
             try:
                 self.cmd_socket.send_pyobj({"cmd": "SET_MASK", "points": self.mask_points, "K": K_list})
                 self.cmd_socket.recv_string()
@@ -693,33 +1346,80 @@ class ClientApp(QMainWindow):
 
     def start_drawing_mode(self):
         if self.thread.tracking_active: self.toggle_tracking()
-        self.current_box_points = None 
+        self.current_box_points = None
+        self._box_lines = None
+        self._axis_lines = None
         self.drawing_mode = True
         self.mask_points = []
+        self._overlay_dirty = True
+        self.image_label.update()
         self.btn_mask.setText("Click Point 1...")
         self.status_mask = False 
         self.check_ready_status()
 
+    def _texture_cache_file(self):
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "MTFPL")
+        return os.path.join(cache_dir,
+                            f"textures_{self.server_ip.replace(':', '_')}.pkl")
+
+    def _load_texture_disk_cache(self):
+        try:
+            with open(self._texture_cache_file(), "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _save_texture_disk_cache(self, textures):
+        try:
+            path = self._texture_cache_file()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                pickle.dump(textures, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"[CLIENT] Texturcache nicht schreibbar: {e}")
+
+    def _refresh_texture_list(self):
+        # Hintergrund-Refresh mit eigenem Socket (REQ ist nicht threadsafe);
+        # bei Antwort werden RAM- und Plattencache neu geschrieben
+        if self._texture_refresh is not None and self._texture_refresh.isRunning():
+            return
+        self._texture_refresh = _TextureListWorker(self.server_ip, self)
+        self._texture_refresh.list_ready.connect(self._on_texture_list_refreshed)
+        self._texture_refresh.start()
+
+    def _on_texture_list_refreshed(self, textures):
+        self.texture_cache = textures
+        self._save_texture_disk_cache(textures)
+
     def open_texture_dialog(self):
         if self.texture_cache is None:
             self.btn_texture.setText("⏳ Loading List...")
             QApplication.processEvents()
-        
+
         textures = []
-        
+
         try:
             if self.texture_cache is not None:
                 textures = self.texture_cache
+                self._refresh_texture_list()
             else:
-                self.cmd_socket.send_pyobj({"cmd": "GET_TEXTURES"})
-                response = self.cmd_socket.recv_pyobj()
-                if response.get("status") == "OK":
-                    textures = response.get("textures", [])
-                    textures = sorted(textures, key=lambda x: x['name'].lower())
-                    self.texture_cache = textures
+                # Plattencache pro Server: bei warmem Cache öffnet der Dialog
+                # ohne Netzwerk-Roundtrip; die Liste wird danach im
+                # Hintergrund gegen den Server aufgefrischt
+                textures = self._load_texture_disk_cache()
+                if textures is None:
+                    self.cmd_socket.send_pyobj({"cmd": "GET_TEXTURES"})
+                    response = self.cmd_socket.recv_pyobj()
+                    if response.get("status") == "OK":
+                        textures = response.get("textures", [])
+                        textures = sorted(textures, key=lambda x: x['name'].lower())
+                        self._save_texture_disk_cache(textures)
+                    else:
+                        self.btn_texture.setText("❌ Error")
+                        return
                 else:
-                    self.btn_texture.setText("❌ Error")
-                    return
+                    self._refresh_texture_list()
+                self.texture_cache = textures
 
             if not textures:
                 QMessageBox.information(self, "Info", "Keine Texturen gefunden.")
@@ -771,6 +1471,10 @@ class ClientApp(QMainWindow):
         color = QColorDialog.getColor(initial=self.mask_color)
         if color.isValid():
             self.mask_color = color
+            self._mask_fill = QColor(color)
+            self._mask_fill.setAlpha(100)
+            self._overlay_dirty = True
+            self.image_label.update()
             self.btn_color.setText("✅ Color")            
             self.btn_texture.setText("2b. 🖼️ Texture")
             self.btn_texture.setStyleSheet(self.btn_style_unified)
@@ -779,85 +1483,162 @@ class ClientApp(QMainWindow):
             self.status_appearance = True
             self.check_ready_status()
 
-    def update_image(self, qt_img):
-        pixmap = QPixmap.fromImage(qt_img)
-        painter = QPainter(pixmap)
-        def project(p_3d, pose, K):
-            if pose is None: return None
-            R = pose[:3, :3]; t = pose[:3, 3]
-            p_cam = (R @ p_3d) + t
-            if p_cam[2] <= 0.001: return None
-            p_img = K @ p_cam
-            return (int(p_img[0]/p_img[2]), int(p_img[1]/p_img[2]))
-
-        if self.thread.tracking_active and self.current_box_points:
-            painter.setPen(QPen(QColor(0, 255, 0), 2))
-            pts = self.current_box_points
-            if len(pts) == 8:
-                lines = [(0,1), (1,3), (3,2), (2,0), (4,5), (5,7), (7,6), (6,4), (0,4), (1,5), (2,6), (3,7)]
-                for p1, p2 in lines:
-                    painter.drawLine(pts[p1][0], pts[p1][1], pts[p2][0], pts[p2][1])
-        
-        if self.thread.tracking_active and self.current_pose is not None and self.K is not None:
-            origin = np.array([0.,0.,0.])
-            p_org = project(origin, self.current_pose, self.K)
-            if p_org:
-                cols = [QColor(255,0,0), QColor(0,255,0), QColor(0,0,255)]
-                axes = [np.array([0.1,0,0]), np.array([0,0.1,0]), np.array([0,0,0.1])]
-                for ax, col in zip(axes, cols):
-                    p_end = project(ax, self.current_pose, self.K)
-                    if p_end:
-                        painter.setPen(QPen(col, 3))
-                        painter.drawLine(p_org[0], p_org[1], p_end[0], p_end[1])
+    def _drain_frame(self):
+        while True:
+            try:
+                points, pose, timestamp = self.result_receiver.result_queue.popleft()
+            except IndexError:
+                break
+            self.update_box_points(points, pose, timestamp)
+        try:
+            frame = self.thread.frame_queue.pop()
+        except IndexError:
+            return
+        self._render_frame(frame)
+
+    def _render_frame(self, frame):
+        # QImage ist nur ein View auf das NumPy-Array -> Referenz halten,
+        # damit der Puffer nicht unter Qt wegläuft; fromImage kopiert genau einmal.
+        # Das Overlay zeichnet paintEvent des Labels (siehe _draw_overlay),
+        # die Video-Pixmap selbst wird nie per QPainter angefasst.
+        h, w = frame.shape[:2]
+        # Qt erwartet 4-Byte-alignte Scanlines. 640*3 erfüllt das; falls
+        # jemals ein Modus mit krummer Breite konfiguriert wird, einmal in
+        # einen gepaddeten Puffer kopieren statt Qt intern kopieren zu lassen
+        if frame.strides[0] & 3:
+            padded = (w * 3 + 3) & ~3
+            if self._aligned_buf is None or self._aligned_buf.shape != (h, padded):
+                self._aligned_buf = np.empty((h, padded), np.uint8)
+            self._aligned_buf[:, :w * 3] = frame.reshape(h, -1)
+            frame = self._aligned_buf
+        self._last_frame_arr = frame
+        qt_img = QImage(frame.data, w, h, frame.strides[0], self._qimg_fmt)
+        self._set_pixmap(self._pixmap_from_image(qt_img))
+
+    def _overlay_visible(self):
+        return self.thread.tracking_active or bool(self.mask_points)
+
+    def _draw_overlay(self, painter):
+        if self.thread.tracking_active and self._box_lines:
+            painter.setPen(self._box_pen)
+            painter.drawLines(self._box_lines)
+
+        if self.thread.tracking_active and self._axis_lines:
+            for pen, x1, y1, x2, y2 in self._axis_lines:
+                painter.setPen(pen)
+                painter.drawLine(x1, y1, x2, y2)
 
         if not self.thread.tracking_active or self.drawing_mode:
-            if len(self.mask_points) == 1:
-                painter.setBrush(self.mask_color); painter.drawEllipse(QPoint(self.mask_points[0][0], self.mask_points[0][1]), 4, 4)
-            elif len(self.mask_points) == 2:
-                p1, p2 = self.mask_points
-                x, y = min(p1[0], p2[0]), min(p1[1], p2[1])
-                w, h = abs(p1[0] - p2[0]), abs(p1[1] - p2[1])
-                m_color = QColor(self.mask_color); m_color.setAlpha(100)
-                painter.setBrush(m_color); painter.drawRect(x, y, w, h)
+            if self._overlay_dirty:
+                self._rebuild_mask_overlay()
+            if self._overlay_pixmap is not None:
+                painter.drawPixmap(0, 0, self._overlay_pixmap)
         if self.thread.tracking_active:
-            painter.setPen(QColor("yellow")); painter.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+            painter.setPen(self._fps_pen); painter.setFont(self._fps_font)
             painter.drawText(10, 30, f"FPS: {self.tracking_fps}")
-        painter.end()
-        self.image_label.setPixmap(pixmap)
+
+    def _rebuild_mask_overlay(self):
+        # Die Maske ändert sich nur bei Klicks bzw. Farbwechsel -> einmal in
+        # ein transparentes Pixmap vorrendern, pro Frame bleibt nur ein Blit
+        self._overlay_dirty = False
+        if not self.mask_points:
+            self._overlay_pixmap = None
+            return
+        pm = QPixmap(640, 480)
+        pm.fill(Qt.GlobalColor.transparent)
+        qp = QPainter(pm)
+        # Ein QPainterPath + fillPath statt Pen/Brush-Setup und mehreren
+        # Primitive-Aufrufen — Qt batcht die Füllung in einem Durchgang
+        path = QPainterPath()
+        if len(self.mask_points) == 1:
+            path.addEllipse(QPoint(self.mask_points[0][0], self.mask_points[0][1]), 4, 4)
+            qp.fillPath(path, self.mask_color)
+        else:
+            p1, p2 = self.mask_points
+            x, y = min(p1[0], p2[0]), min(p1[1], p2[1])
+            w, h = abs(p1[0] - p2[0]), abs(p1[1] - p2[1])
+            path.addRect(x, y, w, h)
+            qp.fillPath(path, self._mask_fill)
+        qp.end()
+        self._overlay_pixmap = pm
 
     def update_box_points(self, points, pose, timestamp):
         self.current_box_points = points
         self.current_pose = pose
+        self._rebuild_tracking_lines(points, pose)
         
+        # Attributzugriffe einmal auflösen; die Funktion läuft pro Resultpaket
+        ts_ring = self._ts_ring
         now = time.time()
-        self.tracking_fps_buffer.append(now)
-        while self.tracking_fps_buffer and self.tracking_fps_buffer[0] < now - 1.0:
-            self.tracking_fps_buffer.popleft()
-        self.tracking_fps = len(self.tracking_fps_buffer)
+        ts_ring[self._ts_seq & 63] = now
+        self._ts_seq += 1
+        self.tracking_fps = int(np.count_nonzero(ts_ring > now - 1.0))
         
         if self.thread.tracking_active:
             self.image_counter += 1
-            self.pose_log.append({"id": self.image_counter, "ts": timestamp, "pose": pose})
+            if self._pose_log_n >= self.pose_log.shape[0]:
+                self.pose_log = np.concatenate(
+                    (self.pose_log, np.zeros(4096, dtype=self._POSE_LOG_DTYPE)))
+            entry = self.pose_log[self._pose_log_n]
+            entry["id"] = self.image_counter
+            entry["ts"] = timestamp
+            entry["pose"] = pose
+            self._pose_log_n += 1
+
+    def _rebuild_tracking_lines(self, points, pose):
+        # Läuft mit der Trackingrate (Resultpakete), nicht mit der 30-Hz-
+        # Repaint-Rate: Box-Kanten und Achsen werden hier einmal projiziert
+        # und als fertige Linien gecacht, _draw_overlay zeichnet nur noch
+        self._box_lines = None
+        self._axis_lines = None
+
+        if points is not None:
+            pts = np.asarray(points, dtype=np.float64)
+            if pts.shape[0] == 8:
+                a = pts[self._BOX_EDGES[:, 0]]
+                b = pts[self._BOX_EDGES[:, 1]]
+                self._box_lines = [QLineF(pa[0], pa[1], pb[0], pb[1])
+                                   for pa, pb in zip(a, b)]
+
+        if pose is not None and self.K is not None:
+            # Ursprung + 3 Achsenenden in einem einzigen Matmul
+            P = self.K @ np.asarray(pose, dtype=np.float64)[:3, :4]
+            proj = P @ self._AXIS_PTS
+            z = proj[2]
+            if z[0] > 0.001:
+                uv = proj[:2] / z
+                ox, oy = int(uv[0, 0]), int(uv[1, 0])
+                self._axis_lines = [
+                    (pen, ox, oy, int(uv[0, i]), int(uv[1, i]))
+                    for i, pen in enumerate(self._axis_pens, start=1)
+                    if z[i] > 0.001]
 
     def save_log_file(self):
-        if not self.pose_log: return
+        if not self._pose_log_n: return
         file_path, _ = QFileDialog.getSaveFileName(self, "Log speichern", "tracking.log", "Log Files (*.log)")
         if not file_path: return
         try:
+            # Alles in einen StringIO schreiben und in einem Rutsch auf die
+            # Platte; die Posenzeilen formatiert np.savetxt als Block statt
+            # 16 f-Strings pro Eintrag
+            buf = io.StringIO()
+            for entry in self.pose_log[:self._pose_log_n]:
+                buf.write(f"Image: {entry['id']}\nTimestamp: {entry['ts']:.6f}\n")
+                np.savetxt(buf, entry['pose'], fmt="[% .15f]", delimiter=" ")
+                buf.write("\n")
             with open(file_path, "w") as f:
-                for entry in self.pose_log:
-                    f.write(f"Image: {entry['id']}\n")
-                    f.write(f"Timestamp: {entry['ts']:.6f}\n")
-                    for row in entry['pose']:
-                        f.write("".join([f"[{x: .15f}] " for x in row]).strip() + "\n")
-                    f.write("\n")
+                f.write(buf.getvalue())
             self.btn_log.setText("✅ Saved")
         except Exception as e: print(e)
 
     def closeEvent(self, event):
         self.thread.stop()
-        self.result_receiver.stop() 
-        self.cad_preview.plotter.close()
+        self.result_receiver.stop()
+        self.cmd_socket.close()
+        # Gemeinsamen Kontext genau einmal beim App-Ende terminieren
+        self.context.term()
+        if self.cad_preview.plotter is not None:
+            self.cad_preview.plotter.close()
         event.accept()
 
 if __name__ == "__main__":